@@ -8,26 +8,62 @@
 # In[ ]:
 
 
-import json
+import functools
+import hashlib
+import os
+import pickle
+import re
+
+import orjson
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from collections import defaultdict
 
-# Set style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (12, 8)
+# Set NAV_PLOTS=0 to skip matplotlib/seaborn entirely (font-cache scan, style
+# sheets, several MB of RAM) for headless runs that only need the printed summaries
+PLOTS = os.environ.get("NAV_PLOTS", "1") == "1"
+
+if PLOTS:
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from IPython.display import Image, display
+
+    # Set style
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = (12, 8)
+
+FIG_CACHE_DIR = 'cache'
+
+def cached_fig(*frames):
+    """Skip matplotlib rendering when the chart's input data hasn't changed.
+
+    Decorates a zero-arg plot function that returns its figure. The input
+    DataFrames are hashed; if a PNG for that hash already exists it is
+    displayed inline instead of re-drawing, otherwise the function runs and
+    its figure is saved to the cache.
+    """
+    def decorator(plot_fn):
+        @functools.wraps(plot_fn)
+        def wrapper():
+            key = hashlib.md5()
+            for frame in frames:
+                key.update(str(pd.util.hash_pandas_object(frame, index=False).sum()).encode())
+            cache_path = os.path.join(FIG_CACHE_DIR, f'{plot_fn.__name__}-{key.hexdigest()}.png')
+            if os.path.exists(cache_path):
+                display(Image(filename=cache_path))
+                return
+            os.makedirs(FIG_CACHE_DIR, exist_ok=True)
+            fig = plot_fn()
+            fig.savefig(cache_path)
+            plt.show()
+        return wrapper
+    return decorator
 
 
 # In[ ]:
 
 
-# Load the main evaluation results
-with open('/Users/hansenq/Documents/CS/nav-evals/data/eval-outputs/eval-results.json', 'r') as f:
-    eval_data = json.load(f)
-
 # Add thinking model results manually (extracted from output files)
 thinking_results = {
     'sf': {
@@ -60,9 +96,39 @@ thinking_results = {
     }
 }
 
-# Merge thinking results into main data
-for dataset in ['sf', 'ca']:
-    eval_data[dataset].update(thinking_results[dataset])
+def load_eval_data(path):
+    """Load and merge eval results, caching the parsed dict on disk.
+
+    On warm notebook re-runs the pickle load skips JSON parsing entirely. The
+    cache key covers both the JSON file's mtime and the hand-maintained
+    thinking_results dict, so editing either invalidates it.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    key = hashlib.md5(f'{mtime_ns}:{thinking_results!r}'.encode()).hexdigest()
+    cache_path = path + f'.{key}.pkl'
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    # Merge thinking results into main data
+    for dataset in ['sf', 'ca']:
+        data[dataset].update(thinking_results[dataset])
+
+    # Remove caches stranded by earlier keys before writing the fresh one
+    cache_dir = os.path.dirname(path) or '.'
+    stale_prefix = os.path.basename(path) + '.'
+    for name in os.listdir(cache_dir):
+        if name.startswith(stale_prefix) and name.endswith('.pkl'):
+            os.remove(os.path.join(cache_dir, name))
+
+    with open(cache_path, 'wb') as f:
+        pickle.dump(data, f)
+    return data
+
+eval_data = load_eval_data('/Users/hansenq/Documents/CS/nav-evals/data/eval-outputs/eval-results.json')
 
 print(f"Loaded data for {len(eval_data['sf'])} SF models and {len(eval_data['ca'])} CA models")
 
@@ -136,42 +202,74 @@ for model in test_models:
 # In[ ]:
 
 
-# Create comprehensive results dataframe
-results = []
-for dataset in ['sf', 'ca']:
-    for model, data in eval_data[dataset].items():
-        family, company, is_thinking = categorize_model(model)
-        results.append({
-            'model': model,
-            'dataset': dataset,
-            'family': family,
-            'company': company,
-            'is_thinking': is_thinking,
-            'exact_accuracy': data['exactAccuracy'],
-            'mostly_accuracy': data['mostlyAccuracy'],
-            'total_accuracy': data.get('totalAccuracy', data['exactAccuracy'] + data['mostlyAccuracy']),
-            'total_samples': data['totalSamples']
-        })
-
-df = pd.DataFrame(results)
+# Create comprehensive results dataframe in one vectorized pass
+rows = [
+    {
+        'model': model,
+        'dataset': dataset,
+        'exact_accuracy': data['exactAccuracy'],
+        'mostly_accuracy': data['mostlyAccuracy'],
+        'total_accuracy': data.get('totalAccuracy', data['exactAccuracy'] + data['mostlyAccuracy']),
+        'total_samples': data['totalSamples']
+    }
+    for dataset in ['sf', 'ca']
+    for model, data in eval_data[dataset].items()
+]
+df = pd.DataFrame.from_records(rows)
+
+# Derive categorization columns with vectorized string ops instead of per-row calls.
+# One compiled alternation scans each model name once instead of ~8 substring checks.
+fam_pat = re.compile(r'(o3|o4|gpt|claude|grok|deepseek|gemini|llama|kimi)')
+model_lower = df['model'].str.lower()
+df['family'] = (
+    model_lower.str.extract(fam_pat, expand=False)
+    .fillna('other')
+    .replace({'o3': 'o-series', 'o4': 'o-series'})
+)
+df['company'] = df['family'].map({
+    'o-series': 'openai', 'gpt': 'openai', 'claude': 'anthropic',
+    'gemini': 'google', 'grok': 'x-ai', 'deepseek': 'deepseek',
+    'kimi': 'moonshot', 'llama': 'meta', 'other': 'other'
+})
+df['is_thinking'] = (
+    model_lower.str.contains('--thinking', regex=False)
+    | model_lower.str.startswith(('o3', 'o4'))
+    | model_lower.str.contains('deepseek-r1|grok|gemini')
+)
+
+# Low-cardinality label columns as categoricals: groupbys and masks hash int8
+# codes instead of Python strings
+for col in ('dataset', 'family', 'company'):
+    df[col] = df[col].astype('category')
+
+# Materialize the per-dataset and per-(dataset, thinking) subframes once;
+# sections below reuse these instead of re-scanning df with boolean masks
+splits = {k: v for k, v in df.groupby('dataset', observed=True)}
+thinking_split = {k: v.sort_values('total_accuracy', ascending=False, kind='stable')
+                  for k, v in df.groupby(['dataset', 'is_thinking'], observed=True)}
+
+# Pre-sorted per-dataset views: .head(k) on these replaces repeated .nlargest(k)
+# scans of the same subframe
+sorted_splits_exact = {k: v.sort_values('exact_accuracy', ascending=False, kind='stable') for k, v in splits.items()}
+sorted_splits_total = {k: v.sort_values('total_accuracy', ascending=False, kind='stable') for k, v in splits.items()}
 
 # Top performers for each dataset and metric
 print("=== TOP 10 MODELS BY EXACT ACCURACY ===")
 print("\nSF Dataset:")
-sf_exact = df[df['dataset'] == 'sf'].nlargest(10, 'exact_accuracy')[['model', 'exact_accuracy', 'family', 'is_thinking']]
+sf_exact = sorted_splits_exact['sf'].head(10)[['model', 'exact_accuracy', 'family', 'is_thinking']]
 print(sf_exact.to_string(index=False))
 
 print("\nCA Dataset:")
-ca_exact = df[df['dataset'] == 'ca'].nlargest(10, 'exact_accuracy')[['model', 'exact_accuracy', 'family', 'is_thinking']]
+ca_exact = sorted_splits_exact['ca'].head(10)[['model', 'exact_accuracy', 'family', 'is_thinking']]
 print(ca_exact.to_string(index=False))
 
 print("\n=== TOP 10 MODELS BY MOSTLY-CORRECT ACCURACY ===")
 print("\nSF Dataset:")
-sf_mostly = df[df['dataset'] == 'sf'].nlargest(10, 'total_accuracy')[['model', 'total_accuracy', 'mostly_accuracy', 'family', 'is_thinking']]
+sf_mostly = sorted_splits_total['sf'].head(10)[['model', 'total_accuracy', 'mostly_accuracy', 'family', 'is_thinking']]
 print(sf_mostly.to_string(index=False))
 
 print("\nCA Dataset:")
-ca_mostly = df[df['dataset'] == 'ca'].nlargest(10, 'total_accuracy')[['model', 'total_accuracy', 'mostly_accuracy', 'family', 'is_thinking']]
+ca_mostly = sorted_splits_total['ca'].head(10)[['model', 'total_accuracy', 'mostly_accuracy', 'family', 'is_thinking']]
 print(ca_mostly.to_string(index=False))
 
 
@@ -180,8 +278,12 @@ print(ca_mostly.to_string(index=False))
 # In[ ]:
 
 
-# Get best result from each family
-family_best = df.loc[df.groupby(['dataset', 'family'])['total_accuracy'].idxmax()].reset_index(drop=True)
+# Get best result from each family (one stable sort + dedup beats groupby + idxmax + fancy indexing)
+family_best = (
+    df.sort_values('total_accuracy', ascending=False, kind='stable')
+    .drop_duplicates(subset=['dataset', 'family'])
+    .reset_index(drop=True)
+)
 
 print("=== BEST RESULT FROM EACH MODEL FAMILY ===")
 for dataset in ['sf', 'ca']:
@@ -190,21 +292,26 @@ for dataset in ['sf', 'ca']:
     print(dataset_family[['family', 'model', 'exact_accuracy', 'total_accuracy']].to_string(index=False))
 
 # Visualize family comparison
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+@cached_fig(family_best)
+def plot_family_comparison():
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+
+    for i, dataset in enumerate(['sf', 'ca']):
+        data = family_best[family_best['dataset'] == dataset].sort_values('total_accuracy', ascending=True)
+        axes[i].barh(data['family'], data['total_accuracy'])
+        axes[i].set_title(f'{dataset.upper()} Dataset - Best Family Performance')
+        axes[i].set_xlabel('Total Accuracy (Mostly-Correct)')
+        axes[i].grid(axis='x', alpha=0.3)
 
-for i, dataset in enumerate(['sf', 'ca']):
-    data = family_best[family_best['dataset'] == dataset].sort_values('total_accuracy', ascending=True)
-    axes[i].barh(data['family'], data['total_accuracy'])
-    axes[i].set_title(f'{dataset.upper()} Dataset - Best Family Performance')
-    axes[i].set_xlabel('Total Accuracy (Mostly-Correct)')
-    axes[i].grid(axis='x', alpha=0.3)
+        # Add value labels
+        for j, v in enumerate(data['total_accuracy']):
+            axes[i].text(v + 0.01, j, f'{v:.3f}', va='center')
 
-    # Add value labels
-    for j, v in enumerate(data['total_accuracy']):
-        axes[i].text(v + 0.01, j, f'{v:.3f}', va='center')
+    plt.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    plot_family_comparison()
 
 
 # ## 3. Thinking vs Non-Thinking Models
@@ -213,7 +320,7 @@ plt.show()
 
 
 # Compare thinking vs non-thinking models
-thinking_comparison = df.groupby(['dataset', 'is_thinking']).agg({
+thinking_comparison = df.groupby(['dataset', 'is_thinking'], observed=True).agg({
     'exact_accuracy': ['mean', 'max', 'std'],
     'total_accuracy': ['mean', 'max', 'std'],
     'model': 'count'
@@ -224,40 +331,41 @@ print(thinking_comparison)
 
 # Best thinking and non-thinking models
 print("\n=== BEST THINKING MODELS ===")
-thinking_models = df[df['is_thinking'] == True]
 for dataset in ['sf', 'ca']:
-    best_thinking = thinking_models[thinking_models['dataset'] == dataset].nlargest(3, 'total_accuracy')
+    best_thinking = thinking_split[(dataset, True)].head(3)
     print(f"\n{dataset.upper()} Dataset:")
     print(best_thinking[['model', 'exact_accuracy', 'total_accuracy', 'family']].to_string(index=False))
 
 print("\n=== BEST NON-THINKING MODELS ===")
-non_thinking_models = df[df['is_thinking'] == False]
 for dataset in ['sf', 'ca']:
-    best_non_thinking = non_thinking_models[non_thinking_models['dataset'] == dataset].nlargest(3, 'total_accuracy')
+    best_non_thinking = thinking_split[(dataset, False)].head(3)
     print(f"\n{dataset.upper()} Dataset:")
     print(best_non_thinking[['model', 'exact_accuracy', 'total_accuracy', 'family']].to_string(index=False))
 
 # Visualize thinking vs non-thinking
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+@cached_fig(df)
+def plot_thinking_comparison():
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
 
-metrics = [('exact_accuracy', 'Exact Accuracy'), ('total_accuracy', 'Total Accuracy (Mostly-Correct)')]
-datasets = ['sf', 'ca']
+    metrics = [('exact_accuracy', 'Exact Accuracy'), ('total_accuracy', 'Total Accuracy (Mostly-Correct)')]
+    datasets = ['sf', 'ca']
 
-for i, (metric, title) in enumerate(metrics):
-    for j, dataset in enumerate(datasets):
-        data = df[df['dataset'] == dataset]
+    for i, (metric, title) in enumerate(metrics):
+        for j, dataset in enumerate(datasets):
+            thinking_data = thinking_split[(dataset, True)][metric]
+            non_thinking_data = thinking_split[(dataset, False)][metric]
 
-        thinking_data = data[data['is_thinking'] == True][metric]
-        non_thinking_data = data[data['is_thinking'] == False][metric]
+            axes[i,j].boxplot([thinking_data, non_thinking_data],
+                             labels=['Thinking', 'Non-Thinking'])
+            axes[i,j].set_title(f'{dataset.upper()} Dataset - {title}')
+            axes[i,j].set_ylabel('Accuracy')
+            axes[i,j].grid(alpha=0.3)
 
-        axes[i,j].boxplot([thinking_data, non_thinking_data], 
-                         labels=['Thinking', 'Non-Thinking'])
-        axes[i,j].set_title(f'{dataset.upper()} Dataset - {title}')
-        axes[i,j].set_ylabel('Accuracy')
-        axes[i,j].grid(alpha=0.3)
+    plt.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    plot_thinking_comparison()
 
 
 # ## 4. Thinking Improvement Impact
@@ -265,35 +373,30 @@ plt.show()
 # In[ ]:
 
 
-# Calculate thinking improvement for models that have both versions
-thinking_improvements = []
-
-# Find models with both thinking and non-thinking versions
-for dataset in ['sf', 'ca']:
-    models_in_dataset = set(df[df['dataset'] == dataset]['model'].str.replace('--thinking', ''))
-
-    for base_model in models_in_dataset:
-        thinking_version = base_model + '--thinking'
-
-        # Check if both versions exist
-        base_data = df[(df['dataset'] == dataset) & (df['model'] == base_model)]
-        thinking_data = df[(df['dataset'] == dataset) & (df['model'] == thinking_version)]
-
-        if not base_data.empty and not thinking_data.empty:
-            base_acc = base_data.iloc[0]['total_accuracy']
-            thinking_acc = thinking_data.iloc[0]['total_accuracy']
-            improvement = thinking_acc - base_acc
-
-            thinking_improvements.append({
-                'dataset': dataset,
-                'base_model': base_model,
-                'base_accuracy': base_acc,
-                'thinking_accuracy': thinking_acc,
-                'improvement': improvement,
-                'relative_improvement': improvement / base_acc if base_acc > 0 else 0
-            })
-
-improvement_df = pd.DataFrame(thinking_improvements)
+# Calculate thinking improvement for models that have both versions.
+# Self-join via pivot: one vectorized reshape instead of boolean-mask scans per model.
+wide = (
+    df.assign(base_model=df['model'].str.replace('--thinking', '', regex=False))
+    .pivot_table(index=['dataset', 'base_model'], columns='is_thinking',
+                 values='total_accuracy', aggfunc='first', observed=True)
+    .reset_index()
+)
+
+# Keep only base models with both a thinking and non-thinking version
+wide = wide[wide[True].notna() & wide[False].notna()]
+
+improvement_df = pd.DataFrame({
+    'dataset': wide['dataset'],
+    'base_model': wide['base_model'],
+    'base_accuracy': wide[False],
+    'thinking_accuracy': wide[True],
+    'improvement': wide[True] - wide[False],
+}).reset_index(drop=True)
+improvement_df['relative_improvement'] = np.where(
+    improvement_df['base_accuracy'] > 0,
+    improvement_df['improvement'] / improvement_df['base_accuracy'],
+    0
+)
 
 if not improvement_df.empty:
     print("=== THINKING MODEL IMPROVEMENTS ===")
@@ -306,24 +409,29 @@ if not improvement_df.empty:
     print(f"Models improved: {(improvement_df['improvement'] > 0).sum()}/{len(improvement_df)}")
 
     # Visualize improvements
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-
-    for i, dataset in enumerate(['sf', 'ca']):
-        data = improvement_df[improvement_df['dataset'] == dataset]
-        if not data.empty:
-            x_pos = range(len(data))
-            axes[i].bar(x_pos, data['improvement'], 
-                       color=['green' if x > 0 else 'red' for x in data['improvement']])
-            axes[i].set_title(f'{dataset.upper()} Dataset - Thinking Model Improvements')
-            axes[i].set_xlabel('Models')
-            axes[i].set_ylabel('Accuracy Improvement')
-            axes[i].set_xticks(x_pos)
-            axes[i].set_xticklabels([m.replace('claude-', '') for m in data['base_model']], rotation=45)
-            axes[i].axhline(y=0, color='black', linestyle='-', alpha=0.3)
-            axes[i].grid(axis='y', alpha=0.3)
-
-    plt.tight_layout()
-    plt.show()
+    @cached_fig(improvement_df)
+    def plot_thinking_improvements():
+        fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+
+        for i, dataset in enumerate(['sf', 'ca']):
+            data = improvement_df[improvement_df['dataset'] == dataset]
+            if not data.empty:
+                x_pos = range(len(data))
+                axes[i].bar(x_pos, data['improvement'],
+                           color=['green' if x > 0 else 'red' for x in data['improvement']])
+                axes[i].set_title(f'{dataset.upper()} Dataset - Thinking Model Improvements')
+                axes[i].set_xlabel('Models')
+                axes[i].set_ylabel('Accuracy Improvement')
+                axes[i].set_xticks(x_pos)
+                axes[i].set_xticklabels([m.replace('claude-', '') for m in data['base_model']], rotation=45)
+                axes[i].axhline(y=0, color='black', linestyle='-', alpha=0.3)
+                axes[i].grid(axis='y', alpha=0.3)
+
+        plt.tight_layout()
+        return fig
+
+    if PLOTS:
+        plot_thinking_improvements()
 else:
     print("No models found with both thinking and non-thinking versions")
 
@@ -333,8 +441,12 @@ else:
 # In[ ]:
 
 
-# Best result from each company
-company_best = df.loc[df.groupby(['dataset', 'company'])['total_accuracy'].idxmax()].reset_index(drop=True)
+# Best result from each company (same sort + dedup pattern as family_best)
+company_best = (
+    df.sort_values('total_accuracy', ascending=False, kind='stable')
+    .drop_duplicates(subset=['dataset', 'company'])
+    .reset_index(drop=True)
+)
 
 print("=== BEST RESULT FROM EACH COMPANY ===")
 for dataset in ['sf', 'ca']:
@@ -343,21 +455,22 @@ for dataset in ['sf', 'ca']:
     print(dataset_company[['company', 'model', 'exact_accuracy', 'total_accuracy']].to_string(index=False))
 
 # Visualize company comparison
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+if PLOTS:
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
 
-for i, dataset in enumerate(['sf', 'ca']):
-    data = company_best[company_best['dataset'] == dataset].sort_values('total_accuracy', ascending=True)
-    bars = axes[i].barh(data['company'], data['total_accuracy'])
-    axes[i].set_title(f'{dataset.upper()} Dataset - Best Company Performance')
-    axes[i].set_xlabel('Total Accuracy (Mostly-Correct)')
-    axes[i].grid(axis='x', alpha=0.3)
+    for i, dataset in enumerate(['sf', 'ca']):
+        data = company_best[company_best['dataset'] == dataset].sort_values('total_accuracy', ascending=True)
+        bars = axes[i].barh(data['company'], data['total_accuracy'])
+        axes[i].set_title(f'{dataset.upper()} Dataset - Best Company Performance')
+        axes[i].set_xlabel('Total Accuracy (Mostly-Correct)')
+        axes[i].grid(axis='x', alpha=0.3)
 
-    # Add value labels
-    for j, v in enumerate(data['total_accuracy']):
-        axes[i].text(v + 0.01, j, f'{v:.3f}', va='center')
+        # Add value labels
+        for j, v in enumerate(data['total_accuracy']):
+            axes[i].text(v + 0.01, j, f'{v:.3f}', va='center')
 
-plt.tight_layout()
-plt.show()
+    plt.tight_layout()
+    plt.show()
 
 
 # ## 6. SF vs CA Dataset Comparison
@@ -366,7 +479,7 @@ plt.show()
 
 
 # Compare overall difficulty between datasets
-dataset_stats = df.groupby('dataset').agg({
+dataset_stats = df.groupby('dataset', observed=True).agg({
     'exact_accuracy': ['mean', 'median', 'std', 'max'],
     'total_accuracy': ['mean', 'median', 'std', 'max'],
     'model': 'count'
@@ -375,32 +488,21 @@ dataset_stats = df.groupby('dataset').agg({
 print("=== SF vs CA DATASET DIFFICULTY COMPARISON ===")
 print(dataset_stats)
 
-# Models that appear in both datasets
-sf_models = set(df[df['dataset'] == 'sf']['model'])
-ca_models = set(df[df['dataset'] == 'ca']['model'])
-common_models = sf_models.intersection(ca_models)
-
-print(f"\nModels evaluated on both datasets: {len(common_models)}")
+# Models that appear in both datasets: an inner merge on model gives the
+# common set plus both accuracy columns in one hash-join
+comparison_df = splits['sf'][['model', 'exact_accuracy', 'total_accuracy']].merge(
+    splits['ca'][['model', 'exact_accuracy', 'total_accuracy']],
+    on='model', suffixes=('_sf', '_ca')
+).rename(columns={
+    'exact_accuracy_sf': 'sf_exact', 'exact_accuracy_ca': 'ca_exact',
+    'total_accuracy_sf': 'sf_total', 'total_accuracy_ca': 'ca_total'
+})
+comparison_df['exact_diff'] = comparison_df['ca_exact'] - comparison_df['sf_exact']
+comparison_df['total_diff'] = comparison_df['ca_total'] - comparison_df['sf_total']
 
-# Compare performance on common models
-if common_models:
-    comparison_data = []
-    for model in common_models:
-        sf_perf = df[(df['dataset'] == 'sf') & (df['model'] == model)].iloc[0]
-        ca_perf = df[(df['dataset'] == 'ca') & (df['model'] == model)].iloc[0]
-
-        comparison_data.append({
-            'model': model,
-            'sf_exact': sf_perf['exact_accuracy'],
-            'ca_exact': ca_perf['exact_accuracy'],
-            'sf_total': sf_perf['total_accuracy'],
-            'ca_total': ca_perf['total_accuracy'],
-            'exact_diff': ca_perf['exact_accuracy'] - sf_perf['exact_accuracy'],
-            'total_diff': ca_perf['total_accuracy'] - sf_perf['total_accuracy']
-        })
-
-    comparison_df = pd.DataFrame(comparison_data)
+print(f"\nModels evaluated on both datasets: {len(comparison_df)}")
 
+if not comparison_df.empty:
     print("\n=== PERFORMANCE COMPARISON ON COMMON MODELS ===")
     print(comparison_df[['model', 'sf_total', 'ca_total', 'total_diff']].sort_values('total_diff', ascending=False).round(3).to_string(index=False))
 
@@ -408,47 +510,52 @@ if common_models:
     print(f"Models performing better on CA: {(comparison_df['total_diff'] > 0).sum()}/{len(comparison_df)}")
 
 # Visualize dataset comparison
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-
-# Distribution comparison
-sf_data = df[df['dataset'] == 'sf']['total_accuracy']
-ca_data = df[df['dataset'] == 'ca']['total_accuracy']
-
-axes[0,0].hist([sf_data, ca_data], bins=15, alpha=0.7, label=['SF', 'CA'])
-axes[0,0].set_title('Accuracy Distribution Comparison')
-axes[0,0].set_xlabel('Total Accuracy')
-axes[0,0].set_ylabel('Count')
-axes[0,0].legend()
-axes[0,0].grid(alpha=0.3)
-
-# Box plot comparison
-axes[0,1].boxplot([sf_data, ca_data], labels=['SF', 'CA'])
-axes[0,1].set_title('Accuracy Distribution Box Plot')
-axes[0,1].set_ylabel('Total Accuracy')
-axes[0,1].grid(alpha=0.3)
-
-# Scatter plot for common models
-if not comparison_df.empty:
-    axes[1,0].scatter(comparison_df['sf_total'], comparison_df['ca_total'], alpha=0.7)
-    axes[1,0].plot([0, 0.7], [0, 0.7], 'r--', alpha=0.5, label='Equal Performance')
-    axes[1,0].set_xlabel('SF Accuracy')
-    axes[1,0].set_ylabel('CA Accuracy')
-    axes[1,0].set_title('SF vs CA Performance (Common Models)')
-    axes[1,0].legend()
-    axes[1,0].grid(alpha=0.3)
-
-# Improvement/degradation from SF to CA
-if not comparison_df.empty:
-    axes[1,1].bar(range(len(comparison_df)), comparison_df['total_diff'],
-                  color=['green' if x > 0 else 'red' for x in comparison_df['total_diff']])
-    axes[1,1].set_title('CA vs SF Performance Difference')
-    axes[1,1].set_xlabel('Models')
-    axes[1,1].set_ylabel('CA - SF Accuracy')
-    axes[1,1].axhline(y=0, color='black', linestyle='-', alpha=0.3)
-    axes[1,1].grid(axis='y', alpha=0.3)
+@cached_fig(df, comparison_df)
+def plot_dataset_comparison():
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    # Distribution comparison
+    sf_data = splits['sf']['total_accuracy']
+    ca_data = splits['ca']['total_accuracy']
+
+    axes[0,0].hist([sf_data, ca_data], bins=15, alpha=0.7, label=['SF', 'CA'])
+    axes[0,0].set_title('Accuracy Distribution Comparison')
+    axes[0,0].set_xlabel('Total Accuracy')
+    axes[0,0].set_ylabel('Count')
+    axes[0,0].legend()
+    axes[0,0].grid(alpha=0.3)
+
+    # Box plot comparison
+    axes[0,1].boxplot([sf_data, ca_data], labels=['SF', 'CA'])
+    axes[0,1].set_title('Accuracy Distribution Box Plot')
+    axes[0,1].set_ylabel('Total Accuracy')
+    axes[0,1].grid(alpha=0.3)
+
+    # Scatter plot for common models
+    if not comparison_df.empty:
+        axes[1,0].scatter(comparison_df['sf_total'], comparison_df['ca_total'], alpha=0.7)
+        axes[1,0].plot([0, 0.7], [0, 0.7], 'r--', alpha=0.5, label='Equal Performance')
+        axes[1,0].set_xlabel('SF Accuracy')
+        axes[1,0].set_ylabel('CA Accuracy')
+        axes[1,0].set_title('SF vs CA Performance (Common Models)')
+        axes[1,0].legend()
+        axes[1,0].grid(alpha=0.3)
+
+    # Improvement/degradation from SF to CA
+    if not comparison_df.empty:
+        axes[1,1].bar(range(len(comparison_df)), comparison_df['total_diff'],
+                      color=['green' if x > 0 else 'red' for x in comparison_df['total_diff']])
+        axes[1,1].set_title('CA vs SF Performance Difference')
+        axes[1,1].set_xlabel('Models')
+        axes[1,1].set_ylabel('CA - SF Accuracy')
+        axes[1,1].axhline(y=0, color='black', linestyle='-', alpha=0.3)
+        axes[1,1].grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    plot_dataset_comparison()
 
 
 # ## 7. Additional Interesting Analysis
@@ -476,35 +583,40 @@ token_df = pd.DataFrame(token_data)
 
 if not token_df.empty:
     # Token usage by thinking models
-    thinking_tokens = token_df.groupby(['dataset', 'is_thinking'])['avg_tokens'].agg(['mean', 'median', 'std']).round(1)
+    thinking_tokens = token_df.groupby(['dataset', 'is_thinking'], observed=True)['avg_tokens'].agg(['mean', 'median', 'std']).round(1)
     print("\nAverage token usage by thinking capability:")
     print(thinking_tokens)
 
     # Efficiency: accuracy per token
     token_df['efficiency'] = token_df['total_accuracy'] / token_df['avg_tokens'] * 1000  # accuracy per 1k tokens
+    token_sorted = token_df.sort_values('efficiency', ascending=False, kind='stable')
 
     print("\n=== MOST EFFICIENT MODELS (Accuracy per 1K tokens) ===")
     for dataset in ['sf', 'ca']:
         print(f"\n{dataset.upper()} Dataset:")
-        efficient = token_df[token_df['dataset'] == dataset].nlargest(5, 'efficiency')
+        efficient = token_sorted[token_sorted['dataset'] == dataset].head(5)
         print(efficient[['model', 'total_accuracy', 'avg_tokens', 'efficiency']].round(3).to_string(index=False))
 
 # Model size/complexity analysis
 print("\n\n=== MODEL COMPLEXITY ANALYSIS ===")
-complexity_order = {
-    'haiku': 1, 'mini': 2, 'sonnet': 3, 'gpt-4': 4, 'opus': 5, 
-    'turbo': 4, 'o3': 6, 'o4': 7, 'grok': 5, 'gemini': 4
-}
-
-def get_complexity(model_name):
-    model_lower = model_name.lower()
-    for key, value in complexity_order.items():
-        if key in model_lower:
-            return value
-    return 3  # default
-
-df['complexity'] = df['model'].apply(get_complexity)
-complexity_perf = df.groupby(['dataset', 'complexity']).agg({
+# Conditions checked in order, first match wins (e.g. 'haiku' before 'mini')
+df['complexity'] = np.select(
+    [
+        model_lower.str.contains('haiku'),
+        model_lower.str.contains('mini'),
+        model_lower.str.contains('sonnet'),
+        model_lower.str.contains('gpt-4'),
+        model_lower.str.contains('opus'),
+        model_lower.str.contains('turbo'),
+        model_lower.str.contains('o3'),
+        model_lower.str.contains('o4'),
+        model_lower.str.contains('grok'),
+        model_lower.str.contains('gemini'),
+    ],
+    [1, 2, 3, 4, 5, 4, 6, 7, 5, 4],
+    default=3
+)
+complexity_perf = df.groupby(['dataset', 'complexity'], observed=True).agg({
     'total_accuracy': ['mean', 'max'],
     'model': 'count'
 }).round(3)
@@ -514,16 +626,16 @@ print(complexity_perf)
 
 # Model release date analysis (approximate)
 print("\n\n=== PERFORMANCE BY MODEL GENERATION ===")
-def get_generation(model_name):
-    if '2025' in model_name or 'o3' in model_name or 'o4' in model_name or 'grok-4' in model_name:
-        return '2025'
-    elif '2024' in model_name:
-        return '2024'
-    else:
-        return 'older'
-
-df['generation'] = df['model'].apply(get_generation)
-generation_perf = df.groupby(['dataset', 'generation']).agg({
+df['generation'] = np.select(
+    [
+        model_lower.str.contains('2025|o3|o4|grok-4'),
+        model_lower.str.contains('2024'),
+    ],
+    ['2025', '2024'],
+    default='older'
+)
+df['generation'] = df['generation'].astype('category')
+generation_perf = df.groupby(['dataset', 'generation'], observed=True).agg({
     'total_accuracy': ['mean', 'max', 'count'],
     'exact_accuracy': ['mean', 'max']
 }).round(3)
@@ -540,8 +652,8 @@ print("=== KEY INSIGHTS SUMMARY ===")
 print()
 
 # Best overall performers
-sf_best = df[df['dataset'] == 'sf'].nlargest(1, 'total_accuracy').iloc[0]
-ca_best = df[df['dataset'] == 'ca'].nlargest(1, 'total_accuracy').iloc[0]
+sf_best = sorted_splits_total['sf'].iloc[0]
+ca_best = sorted_splits_total['ca'].iloc[0]
 
 print(f"1. BEST OVERALL MODELS:")
 print(f"   SF Dataset: {sf_best['model']} ({sf_best['total_accuracy']:.1%})")
@@ -550,27 +662,27 @@ print(f"   CA Dataset: {ca_best['model']} ({ca_best['total_accuracy']:.1%})")
 # Family winners
 print(f"\n2. BEST MODEL FAMILIES:")
 for dataset in ['sf', 'ca']:
-    best_family = family_best[family_best['dataset'] == dataset].nlargest(1, 'total_accuracy').iloc[0]
+    best_family = family_best[family_best['dataset'] == dataset].iloc[0]
     print(f"   {dataset.upper()}: {best_family['family']} ({best_family['total_accuracy']:.1%})")
 
 # Company winners
 print(f"\n3. BEST COMPANIES:")
 for dataset in ['sf', 'ca']:
-    best_company = company_best[company_best['dataset'] == dataset].nlargest(1, 'total_accuracy').iloc[0]
+    best_company = company_best[company_best['dataset'] == dataset].iloc[0]
     print(f"   {dataset.upper()}: {best_company['company']} ({best_company['total_accuracy']:.1%})")
 
 # Thinking advantage
 print(f"\n4. THINKING MODEL ADVANTAGE:")
 for dataset in ['sf', 'ca']:
-    thinking_mean = df[(df['dataset'] == dataset) & (df['is_thinking'] == True)]['total_accuracy'].mean()
-    non_thinking_mean = df[(df['dataset'] == dataset) & (df['is_thinking'] == False)]['total_accuracy'].mean()
+    thinking_mean = thinking_split[(dataset, True)]['total_accuracy'].mean()
+    non_thinking_mean = thinking_split[(dataset, False)]['total_accuracy'].mean()
     advantage = thinking_mean - non_thinking_mean
     print(f"   {dataset.upper()}: {advantage:+.1%} advantage for thinking models")
 
 # Dataset difficulty
 print(f"\n5. DATASET DIFFICULTY:")
-sf_mean = df[df['dataset'] == 'sf']['total_accuracy'].mean()
-ca_mean = df[df['dataset'] == 'ca']['total_accuracy'].mean()
+sf_mean = splits['sf']['total_accuracy'].mean()
+ca_mean = splits['ca']['total_accuracy'].mean()
 print(f"   SF average: {sf_mean:.1%}")
 print(f"   CA average: {ca_mean:.1%}")
 print(f"   CA is {(ca_mean - sf_mean):.1%} easier on average")
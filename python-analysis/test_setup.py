@@ -3,21 +3,31 @@
 Quick test to verify the Python environment is working correctly.
 """
 
-import json
+import importlib.util
+
+try:
+    import orjson as json_parser
+except ImportError:
+    import json as json_parser
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import plotly.express as px
 
 print("✅ All imports successful!")
 print(f"📊 Pandas version: {pd.__version__}")
 print(f"📈 Matplotlib version: {plt.matplotlib.__version__}")
 print(f"🎨 Seaborn version: {sns.__version__}")
 
+# Check plotly is installed without importing it (plotly's import is slow)
+if importlib.util.find_spec('plotly'):
+    print("✅ Plotly is installed")
+else:
+    print("❌ Plotly is not installed")
+
 # Test loading the data
 try:
-    with open('../data/eval-outputs/eval-results.json', 'r') as f:
-        data = json.load(f)
+    with open('../data/eval-outputs/eval-results.json', 'rb') as f:
+        data = json_parser.loads(f.read())
     print(f"✅ Successfully loaded eval-results.json")
     print(f"📁 Found {len(data)} categories: {list(data.keys())}")
 except Exception as e: